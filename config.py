@@ -10,6 +10,7 @@ class Config:
     DB_PASSWORD = os.environ.get('DB_PASSWORD', 'pCUCW1!9ByEsds9vooAi')
     DB_NAME = os.environ.get('DB_NAME', 'databasenjd_db')
     DB_PORT = int(os.environ.get('DB_PORT', 3306))
+    DB_READ_HOST = os.environ.get('DB_READ_HOST', DB_HOST)
     
     # API configuration
     API_KEY = os.environ.get('API_KEY', 'your-secret-api-key')
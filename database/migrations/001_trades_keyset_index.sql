@@ -0,0 +1,18 @@
+-- Keyset pagination for GET /api/trades/<account_number>
+-- Serves "ORDER BY open_time DESC, ticket DESC" seeks from the index;
+-- replaces the narrower idx_trades_account_time, which is a prefix of it.
+CREATE INDEX idx_trades_account_time_ticket ON trades(account_number, open_time DESC, ticket DESC);
+
+-- Databases provisioned by deploy-complete.sh never had idx_trades_account_time
+SET @index_exists = (SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+    AND TABLE_NAME = 'trades'
+    AND INDEX_NAME = 'idx_trades_account_time');
+
+SET @sql = IF(@index_exists > 0,
+    'DROP INDEX idx_trades_account_time ON trades',
+    'SELECT "Index idx_trades_account_time does not exist"');
+
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
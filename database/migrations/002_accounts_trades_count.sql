@@ -0,0 +1,7 @@
+-- Denormalized trade counter for GET /api/accounts
+-- Maintained by POST /api/trades; replaces the LEFT JOIN + GROUP BY on trades.
+ALTER TABLE accounts ADD COLUMN trades_count INT NOT NULL DEFAULT 0 AFTER free_margin;
+
+UPDATE accounts a
+SET a.trades_count = (SELECT COUNT(*) FROM trades t WHERE t.account_number = a.account_number),
+    a.last_update = a.last_update;
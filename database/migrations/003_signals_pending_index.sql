@@ -0,0 +1,6 @@
+-- Pending signals for GET /api/signals/<account_number>
+-- "WHERE account_number = ? AND processed = FALSE ORDER BY created_at" is
+-- read in index order with no filesort; replaces idx_account_processed,
+-- which is a prefix of it.
+CREATE INDEX idx_signals_account_processed_created ON trade_signals(account_number, processed, created_at);
+DROP INDEX idx_account_processed ON trade_signals;
@@ -10,6 +10,7 @@ CREATE TABLE accounts (
     equity DECIMAL(15,2) DEFAULT 0,
     margin DECIMAL(15,2) DEFAULT 0,
     free_margin DECIMAL(15,2) DEFAULT 0,
+    trades_count INT NOT NULL DEFAULT 0,
     last_update TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -47,10 +48,10 @@ CREATE TABLE trade_signals (
     processed_at TIMESTAMP NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (account_number) REFERENCES accounts(account_number) ON DELETE CASCADE,
-    INDEX idx_account_processed (account_number, processed),
+    INDEX idx_signals_account_processed_created (account_number, processed, created_at),
     INDEX idx_created_at (created_at)
 );
 
 -- Create indexes for better performance
-CREATE INDEX idx_trades_account_time ON trades(account_number, open_time DESC);
+CREATE INDEX idx_trades_account_time_ticket ON trades(account_number, open_time DESC, ticket DESC);
 CREATE INDEX idx_accounts_update ON accounts(last_update DESC);
\ No newline at end of file
@@ -0,0 +1,20 @@
+import os
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker processes: threaded workers so concurrent requests share each
+# worker's connection pool instead of queueing behind one another
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+timeout = 120
+
+# Keep client connections open between publishes so the EA does not pay a
+# new TCP/TLS handshake for every request
+keepalive = 30
+
+# main.py opens the MySQL pool and starts the publish writer thread at
+# import time; importing it after fork gives every worker its own sockets
+# and writer instead of sharing the master's
+preload_app = False
@@ -1,11 +1,23 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
 import mysql.connector
 from mysql.connector import pooling
+from mysql.connector.constants import ClientFlag
 import os
-from datetime import datetime
+import atexit
+import queue
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
 import json
+import msgspec
+import orjson
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
+from typing import Annotated, List, Optional, Union
+import hmac
+import threading
 import time
 
 # Configure logging
@@ -17,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Request threads per gunicorn worker, see gunicorn.conf.py
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 16))
+
 # Database configuration with connection pooling
 DB_CONFIG = {
     'host': os.environ.get('DB_HOST', 'database-eva-service'),
@@ -25,14 +40,123 @@ DB_CONFIG = {
     'database': os.environ.get('DB_NAME', 'databasenjd_db'),
     'port': int(os.environ.get('DB_PORT', 3306)),
     'pool_name': 'trade_pool',
-    'pool_size': 10,
-    'pool_reset_session': True,
-    'autocommit': True
+    # Per gunicorn worker, and the pool fails rather than waits when empty:
+    # one connection per request thread plus the publish writer (max 32).
+    # Every slot is opened at startup, so the server sees workers times
+    # this, twice over during a graceful reload; keep that under
+    # max_connections. A streaming get_trades response holds its
+    # connection until the last chunk is sent, so a slow client occupies
+    # a slot for the whole download.
+    'pool_size': min(int(os.environ.get('DB_POOL_SIZE', GUNICORN_THREADS + 1)),
+                     pooling.CNX_POOL_MAXSIZE),
+    # Sessions are not reset on checkout: COM_RESET_CONNECTION costs a
+    # round-trip on every request. This relies on no endpoint leaving
+    # session state behind: no SET, USE or temporary tables, and every
+    # transaction is committed or rolled back before its connection is
+    # returned to the pool.
+    'pool_reset_session': False,
+    'autocommit': True,
+    # Use the C extension so parameter conversion and escaping run in C
+    'use_pure': False,
+    # Lets the publish writer send the account upsert and trade inserts together
+    'client_flags': [ClientFlag.MULTI_STATEMENTS]
 }
 
+# Read-only endpoints use a separate pool, pointed at a replica when
+# DB_READ_HOST is set
+DB_READ_HOST = os.environ.get('DB_READ_HOST', DB_CONFIG['host'])
+READ_DB_CONFIG = dict(
+    DB_CONFIG,
+    host=DB_READ_HOST,
+    pool_name='trade_read',
+    # Only request threads read, the publish writer uses the main pool
+    pool_size=min(int(os.environ.get('DB_READ_POOL_SIZE', GUNICORN_THREADS)),
+                  pooling.CNX_POOL_MAXSIZE)
+)
+
+# Maximum trades per multi-row INSERT, keeps statements under max_allowed_packet
+TRADE_BATCH_SIZE = int(os.environ.get('TRADE_BATCH_SIZE', 1000))
+
+# Rows fetched per round-trip while streaming get_trades responses
+STREAM_FETCH_SIZE = 256
+
+# Published payloads are queued and written by a background thread in
+# batches of up to PUBLISH_MAX_BATCH, waiting at most PUBLISH_MAX_WAIT seconds
+PUBLISH_MAX_BATCH = int(os.environ.get('PUBLISH_MAX_BATCH', 500))
+PUBLISH_MAX_WAIT = int(os.environ.get('PUBLISH_MAX_WAIT_MS', 25)) / 1000
+publish_queue = queue.SimpleQueue()
+# Queued at exit to tell the writer to finish its batch and stop
+PUBLISH_STOP = object()
+publish_stopping = threading.Event()
+
+# Backoff for transient write errors, in seconds; retries continue until the
+# database is back, except at exit where PUBLISH_EXIT_ATTEMPTS bounds them
+PUBLISH_RETRY_DELAY = 0.5
+PUBLISH_RETRY_MAX_DELAY = 30
+PUBLISH_EXIT_ATTEMPTS = 3
+# Seconds the exit hook waits for the writer's batch, inside gunicorn's
+# default 30 second graceful_timeout
+PUBLISH_EXIT_TIMEOUT = 20
+
 # API Key for authentication
 API_KEY = os.environ.get('API_KEY', 'your-secret-api-key')
 
+# Validated Authorization headers, mapped to their expiry time
+AUTH_CACHE_TTL = 300
+AUTH_CACHE_MAX_SIZE = 1024
+_auth_cache = {}
+_auth_cache_lock = threading.Lock()
+
+# Publish payload schema; msgspec decodes and validates it in one pass.
+# Trades without a ticket or symbol are skipped rather than rejected.
+# Kept as lenient as the original dict handling: numeric strings and
+# integral floats are accepted for integer fields, and nulls in nullable
+# columns are stored as NULL. Values are bounded by their columns in
+# database/schema.sql, so anything the writer would fail on gets a 400
+# instead of a 202; the bounds also reject NaN and infinity.
+def integer_column(low, high):
+    """Type for an integer column accepting ints or integral floats in [low, high]"""
+    bounds = msgspec.Meta(ge=low, le=high)
+    return Union[Annotated[int, bounds], Annotated[float, bounds]]
+
+def decimal_column(precision, scale):
+    """Float type bounded like a DECIMAL(precision, scale) column"""
+    limit = 10 ** (precision - scale) - 10 ** -scale
+    return Annotated[float, msgspec.Meta(ge=-limit, le=limit)]
+
+def varchar_column(length):
+    """String type no longer than a VARCHAR(length) column"""
+    return Annotated[str, msgspec.Meta(max_length=length)]
+
+BigInt = integer_column(-2 ** 63, 2 ** 63 - 1)
+TinyInt = integer_column(-128, 127)
+# Unix time within the range of a TIMESTAMP column
+Timestamp = Annotated[float, msgspec.Meta(ge=1, lt=2 ** 31)]
+
+class Trade(msgspec.Struct):
+    ticket: Optional[BigInt] = None
+    symbol: Optional[varchar_column(20)] = None
+    type: TinyInt = 0
+    lots: decimal_column(10, 2) = 0
+    open_price: decimal_column(10, 5) = 0
+    open_time: Optional[Timestamp] = None
+    sl: Optional[decimal_column(10, 5)] = 0
+    tp: Optional[decimal_column(10, 5)] = 0
+    profit: Optional[decimal_column(15, 2)] = 0
+    comment: Optional[varchar_column(255)] = ''
+
+class PublishRequest(msgspec.Struct):
+    account: BigInt
+    server: varchar_column(100)
+    timestamp: Timestamp
+    balance: Optional[decimal_column(15, 2)] = 0
+    equity: Optional[decimal_column(15, 2)] = 0
+    margin: Optional[decimal_column(15, 2)] = 0
+    free_margin: Optional[decimal_column(15, 2)] = 0
+    trades: List[Trade] = []
+
+publish_decoder = msgspec.json.Decoder(PublishRequest, strict=False)
+
 # Initialize connection pool
 try:
     connection_pool = pooling.MySQLConnectionPool(**DB_CONFIG)
@@ -41,14 +165,48 @@ except mysql.connector.Error as err:
     logger.error(f"Error creating connection pool: {err}")
     connection_pool = None
 
-def get_db_connection():
-    """Get database connection from pool"""
+# Initialize read pool; without a replica, reads share the primary pool
+if DB_READ_HOST == DB_CONFIG['host']:
+    read_pool = connection_pool
+else:
     try:
-        if connection_pool:
-            return connection_pool.get_connection()
+        read_pool = pooling.MySQLConnectionPool(**READ_DB_CONFIG)
+        logger.info("Database read pool initialized successfully")
+    except mysql.connector.Error as err:
+        logger.error(f"Error creating read pool: {err}")
+        read_pool = None
+
+def prewarm_connection_pool(pool):
+    """Check out and ping every pooled connection before serving traffic"""
+    conns = []
+    try:
+        # Hold all connections at once so each pool slot is visited; any slot
+        # that dropped since pool creation is reconnected here, not in a request
+        for _ in range(pool.pool_size):
+            conns.append(pool.get_connection())
+        for conn in conns:
+            conn.cmd_ping()
+        logger.info(f"Pre-warmed {len(conns)} connections in {pool.pool_name}")
+    except mysql.connector.Error as err:
+        logger.warning(f"Error pre-warming {pool.pool_name}: {err}")
+    finally:
+        for conn in conns:
+            conn.close()
+
+if connection_pool:
+    prewarm_connection_pool(connection_pool)
+if read_pool and read_pool is not connection_pool:
+    prewarm_connection_pool(read_pool)
+
+def get_db_connection(readonly=False):
+    """Get database connection from pool, the read pool if readonly"""
+    pool, config = (read_pool, READ_DB_CONFIG) if readonly else (connection_pool, DB_CONFIG)
+    try:
+        if pool:
+            return pool.get_connection()
         else:
             # Fallback to direct connection
-            config = DB_CONFIG.copy()
+            config = config.copy()
             config.pop('pool_name', None)
             config.pop('pool_size', None)
             config.pop('pool_reset_session', None)
@@ -60,11 +218,27 @@ def get_db_connection():
 def authenticate_request():
     """Authenticate API request"""
     auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
+    if not auth_header:
+        return False
+    
+    expires_at = _auth_cache.get(auth_header)
+    if expires_at is not None and expires_at > time.time():
+        return True
+    
+    if not auth_header.startswith('Bearer '):
         return False
     
     token = auth_header.split(' ')[1]
-    return token == API_KEY
+    if not hmac.compare_digest(token.encode(), API_KEY.encode()):
+        return False
+    
+    with _auth_cache_lock:
+        _auth_cache.pop(auth_header, None)
+        if len(_auth_cache) >= AUTH_CACHE_MAX_SIZE:
+            # Evict the oldest entry, dicts keep insertion order
+            _auth_cache.pop(next(iter(_auth_cache)))
+        _auth_cache[auth_header] = time.time() + AUTH_CACHE_TTL
+    return True
 
 def require_auth(f):
     """Decorator for authentication"""
@@ -89,22 +263,328 @@ def handle_db_error(f):
             return jsonify({'error': 'Internal server error'}), 500
     return decorated_function
 
+_now_iso_cache = (0, '')
+
+def now_iso():
+    """Current local time as an ISO 8601 string, formatted once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached_iso = _now_iso_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        # Swapped as one tuple so concurrent readers never see a torn pair
+        _now_iso_cache = (second, cached_iso)
+    return cached_iso
+
+def json_default(obj):
+    """Encode values orjson does not handle natively, as Flask's provider does"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):
+        return http_date(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(obj):
+    """Serialize obj to JSON bytes with orjson"""
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify()"""
+    
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_json(obj), mimetype='application/json')
+
+app.json = OrjsonProvider(app)
+
+def stream_trades(cursor, account, pagination):
+    """Stream a get_trades response from cursor"""
+    try:
+        yield b'{"account":' + dumps_json(account) + b',"trades":['
+        
+        trades_count = 0
+        last_trade = None
+        while True:
+            trades = cursor.fetchmany(STREAM_FETCH_SIZE)
+            if not trades:
+                break
+            chunk = b','.join(dumps_json(trade) for trade in trades)
+            yield b',' + chunk if trades_count else chunk
+            trades_count += len(trades)
+            last_trade = trades[-1]
+        
+        pagination['has_more'] = trades_count == pagination['limit']
+        pagination['next_cursor'] = {
+            'before_open_time': last_trade['open_time'],
+            'before_ticket': last_trade['ticket']
+        } if last_trade else None
+        
+        yield (b'],"trades_count":' + dumps_json(trades_count) +
+               b',"pagination":' + dumps_json(pagination) + b'}')
+        
+    except mysql.connector.Error as err:
+        logger.error(f"Database error while streaming trades: {err}")
+        raise
+
+def stream_release(conn, cursor):
+    """Build a callback that returns a streaming response's conn to the pool, once"""
+    released = False
+    
+    def release():
+        nonlocal released
+        if released:
+            return
+        released = True
+        try:
+            if conn.unread_result:
+                # Client went away, fetching failed or the body was never
+                # sent (HEAD); drain so the pooled connection is not handed
+                # out with an unread result
+                cursor.fetchall()
+            cursor.close()
+        except mysql.connector.Error as err:
+            # The result could not be drained: drop the session so the next
+            # checkout reconnects instead of failing on the unread result
+            logger.warning(f"Discarding streamed trades connection: {err}")
+            try:
+                conn.disconnect()
+            except mysql.connector.Error:
+                pass
+        finally:
+            conn.close()
+    
+    return release
+
+@lru_cache(maxsize=64)
+def build_trade_insert(row_count):
+    """Build a multi-row trades upsert with placeholders for row_count rows"""
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * row_count)
+    return f"""
+        INSERT INTO trades (account_number, ticket, symbol, type, lots, open_price, 
+                          open_time, sl, tp, profit, comment, last_update)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE
+        profit = VALUES(profit),
+        sl = VALUES(sl),
+        tp = VALUES(tp),
+        last_update = VALUES(last_update)
+        """
+
+@lru_cache(maxsize=64)
+def build_account_upsert(row_count):
+    """Build a multi-row accounts upsert with placeholders for row_count rows"""
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * row_count)
+    return f"""
+        INSERT INTO accounts (account_number, server, balance, equity, margin, free_margin, last_update)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE
+        balance = VALUES(balance),
+        equity = VALUES(equity),
+        margin = VALUES(margin),
+        free_margin = VALUES(free_margin),
+        last_update = VALUES(last_update)
+        """
+
+@lru_cache(maxsize=64)
+def build_trades_count_refresh(account_count):
+    """Build an UPDATE refreshing trades_count for account_count accounts"""
+    placeholders = ', '.join(['%s'] * account_count)
+    # last_update is pinned so ON UPDATE CURRENT_TIMESTAMP keeps the EA's timestamp
+    return f"""
+        UPDATE accounts
+        SET trades_count = (SELECT COUNT(*) FROM trades
+                            WHERE trades.account_number = accounts.account_number),
+        last_update = last_update
+        WHERE account_number IN ({placeholders})
+        """
+
+def execute_multi(cursor, statements, params):
+    """Execute statements as a single multi-statement round-trip"""
+    for _ in cursor.execute(';'.join(statements), params, multi=True):
+        pass
+
+def write_publish_batch(items):
+    """Write queued publish payloads to the database in one transaction"""
+    conn = get_db_connection()
+    if not conn:
+        raise mysql.connector.InterfaceError('Database connection failed')
+    
+    cursor = conn.cursor()
+    
+    try:
+        conn.start_transaction()
+        
+        # Rows keep queue order, so a later payload for the same account or
+        # ticket wins the ON DUPLICATE KEY UPDATE
+        account_rows = [account_row for _, account_row, _ in items]
+        trade_rows = [row for _, _, rows in items for row in rows]
+        accounts = list(dict.fromkeys(row[0] for row in account_rows))
+        
+        # Send the account upsert, the first trade batch and the counter
+        # refresh as one multi-statement round-trip; further batches go out
+        # on their own to stay under max_allowed_packet
+        statements = [build_account_upsert(len(account_rows))]
+        params = [value for row in account_rows for value in row]
+        for start in range(0, len(trade_rows), TRADE_BATCH_SIZE):
+            if start:
+                execute_multi(cursor, statements, params)
+                statements, params = [], []
+            batch = trade_rows[start:start + TRADE_BATCH_SIZE]
+            statements.append(build_trade_insert(len(batch)))
+            params.extend(value for row in batch for value in row)
+        statements.append(build_trades_count_refresh(len(accounts)))
+        params.extend(accounts)
+        execute_multi(cursor, statements, params)
+        
+        conn.commit()
+        
+    except Exception:
+        conn.rollback()
+        raise
+        
+    finally:
+        cursor.close()
+        conn.close()
+
+def is_transient_db_error(err):
+    """Whether err is worth retrying: lost connection, outage or lock conflict"""
+    if isinstance(err, (mysql.connector.InterfaceError, mysql.connector.OperationalError)):
+        return True
+    # Lock wait timeout, deadlock, server gone away, lost connection
+    return getattr(err, 'errno', None) in (1205, 1213, 2006, 2013)
+
+def write_publish_items(items, max_attempts=None):
+    """Write publish payloads, retrying transient errors with backoff
+
+    Connection loss, outages and lock conflicts are retried with the whole
+    batch, up to max_attempts (forever when None, PUBLISH_EXIT_ATTEMPTS once
+    shutting down), since the clients have already been told their publish
+    was accepted. Any other error isolates the failing payload by retrying
+    one by one, and only that one is dropped.
+    """
+    attempt = 1
+    delay = PUBLISH_RETRY_DELAY
+    while True:
+        try:
+            write_publish_batch(items)
+            trades_count = sum(len(rows) for _, _, rows in items)
+            logger.info(f"Published {trades_count} trades from {len(items)} requests")
+            return
+        except Exception as e:
+            if is_transient_db_error(e):
+                if max_attempts is None and publish_stopping.is_set():
+                    # Shutting down: switch to the exit hook's bounded retries
+                    max_attempts = PUBLISH_EXIT_ATTEMPTS
+                    attempt = 1
+                    delay = PUBLISH_RETRY_DELAY
+                if max_attempts is None or attempt < max_attempts:
+                    logger.warning(f"Writing {len(items)} publishes failed, retrying in {delay:g}s: {e}")
+                    if max_attempts is None:
+                        # Woken early when shutdown starts
+                        publish_stopping.wait(delay)
+                    else:
+                        time.sleep(delay)
+                    attempt += 1
+                    delay = min(delay * 2, PUBLISH_RETRY_MAX_DELAY)
+                    continue
+                for request_id, account_row, _ in items:
+                    logger.error(f"Dropped publish {request_id} for account {account_row[0]}: {e}")
+                return
+            
+            if len(items) == 1:
+                request_id, account_row, _ = items[0]
+                logger.error(f"Dropped publish {request_id} for account {account_row[0]}: {e}")
+                return
+            # Isolate the failing payload instead of dropping the whole batch
+            logger.warning(f"Batch of {len(items)} publishes failed, retrying individually: {e}")
+            for item in items:
+                write_publish_items([item], max_attempts)
+            return
+
+def drain_publish_queue():
+    """Wait for a queued payload, then collect more until the batch fills or times out
+
+    Returns the batch and whether PUBLISH_STOP was taken from the queue.
+    """
+    items = []
+    item = publish_queue.get()
+    deadline = time.monotonic() + PUBLISH_MAX_WAIT
+    while item is not PUBLISH_STOP:
+        items.append(item)
+        timeout = deadline - time.monotonic()
+        if len(items) >= PUBLISH_MAX_BATCH or timeout <= 0:
+            return items, False
+        try:
+            item = publish_queue.get(timeout=timeout)
+        except queue.Empty:
+            return items, False
+    return items, True
+
+def publish_writer():
+    """Background loop writing queued publishes, one transaction per batch"""
+    while True:
+        items, stopping = drain_publish_queue()
+        if items:
+            write_publish_items(items)
+        if stopping:
+            return
+
+publish_thread = threading.Thread(target=publish_writer, name='publish-writer', daemon=True)
+publish_thread.start()
+
+@atexit.register
+def flush_publish_queue():
+    """Let the writer commit the batch it holds, then write what is still queued"""
+    publish_stopping.set()
+    publish_queue.put(PUBLISH_STOP)
+    # The writer takes payloads off the queue as soon as they arrive, so
+    # the last accepted publishes are usually in its batch, not queued.
+    # Bounded so a database outage cannot hang shutdown.
+    publish_thread.join(PUBLISH_EXIT_TIMEOUT)
+    if publish_thread.is_alive():
+        logger.error("Publish writer did not finish its batch before exit")
+    
+    items = []
+    while True:
+        try:
+            item = publish_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not PUBLISH_STOP:
+            items.append(item)
+    for start in range(0, len(items), PUBLISH_MAX_BATCH):
+        write_publish_items(items[start:start + PUBLISH_MAX_BATCH],
+                            max_attempts=PUBLISH_EXIT_ATTEMPTS)
+
+# Static response bodies, encoded once at import
+JSON_HEADERS = {'Content-Type': 'application/json'}
+ROOT_BODY = orjson.dumps({
+    'service': 'Trade Publisher API',
+    'version': '1.0.0',
+    'status': 'running',
+    'endpoints': {
+        'health': '/api/health',
+        'publish_trades': '/api/trades (POST)',
+        'get_trades': '/api/trades/<account_number> (GET)',
+        'get_accounts': '/api/accounts (GET)',
+        'close_trade': '/api/trades/<account_number>/close/<ticket> (POST)',
+        'get_signals': '/api/signals/<account_number> (GET)'
+    }
+})
+NOT_FOUND_BODY = orjson.dumps({'error': 'Endpoint not found'})
+INTERNAL_ERROR_BODY = orjson.dumps({'error': 'Internal server error'})
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint"""
-    return jsonify({
-        'service': 'Trade Publisher API',
-        'version': '1.0.0',
-        'status': 'running',
-        'endpoints': {
-            'health': '/api/health',
-            'publish_trades': '/api/trades (POST)',
-            'get_trades': '/api/trades/<account_number> (GET)',
-            'get_accounts': '/api/accounts (GET)',
-            'close_trade': '/api/trades/<account_number>/close/<ticket> (POST)',
-            'get_signals': '/api/signals/<account_number> (GET)'
-        }
-    }), 200
+    return ROOT_BODY, 200, JSON_HEADERS
 
 @app.route('/api/health', methods=['GET'])
 @require_auth
@@ -122,14 +602,16 @@ def health_check():
         return jsonify({
             'status': 'healthy',
             'database': 'connected',
-            'timestamp': datetime.now().isoformat(),
-            'version': '1.0.0'
+            'timestamp': now_iso(),
+            'version': '1.0.0',
+            'queue_depth': publish_queue.qsize()
         }), 200
     else:
         return jsonify({
             'status': 'unhealthy',
             'database': 'disconnected',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso(),
+            'queue_depth': publish_queue.qsize()
         }), 500
 
 @app.route('/api/trades', methods=['POST'])
@@ -137,106 +619,85 @@ def health_check():
 @handle_db_error
 def publish_trades():
     """Publish trades from MQL4 EA"""
-    data = request.get_json()
-    if not data:
+    body = request.get_data(cache=False)
+    if not body:
         return jsonify({'error': 'No data provided'}), 400
     
-    # Validate required fields
-    required_fields = ['account', 'server', 'timestamp']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({'error': f'Missing required field: {field}'}), 400
-    
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'Database connection failed'}), 500
+    try:
+        data = publish_decoder.decode(body)
+    except msgspec.ValidationError as err:
+        return jsonify({'error': f'Invalid payload: {err}'}), 400
+    except msgspec.DecodeError:
+        return jsonify({'error': 'Invalid JSON'}), 400
     
-    cursor = conn.cursor()
+    account = data.account
+    last_update = datetime.fromtimestamp(data.timestamp)
     
-    try:
-        # Insert/update account info
-        account_query = """
-        INSERT INTO accounts (account_number, server, balance, equity, margin, free_margin, last_update)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        balance = VALUES(balance),
-        equity = VALUES(equity),
-        margin = VALUES(margin),
-        free_margin = VALUES(free_margin),
-        last_update = VALUES(last_update)
-        """
+    # Build trade rows in the column order of the trades INSERT
+    rows = []
+    for trade in data.trades:
+        if trade.ticket is None or trade.symbol is None:
+            continue
         
-        cursor.execute(account_query, (
-            data['account'],
-            data['server'],
-            data.get('balance', 0),
-            data.get('equity', 0),
-            data.get('margin', 0),
-            data.get('free_margin', 0),
-            datetime.fromtimestamp(data['timestamp'])
+        rows.append((
+            account,
+            trade.ticket,
+            trade.symbol,
+            trade.type,
+            trade.lots,
+            trade.open_price,
+            last_update if trade.open_time is None else datetime.fromtimestamp(trade.open_time),
+            trade.sl,
+            trade.tp,
+            trade.profit,
+            trade.comment,
+            last_update
         ))
-        
-        # Insert/update trades
-        trades_inserted = 0
-        for trade in data.get('trades', []):
-            if 'ticket' not in trade or 'symbol' not in trade:
-                continue
-                
-            trade_query = """
-            INSERT INTO trades (account_number, ticket, symbol, type, lots, open_price, 
-                              open_time, sl, tp, profit, comment, last_update)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            profit = VALUES(profit),
-            sl = VALUES(sl),
-            tp = VALUES(tp),
-            last_update = VALUES(last_update)
-            """
-            
-            cursor.execute(trade_query, (
-                data['account'],
-                trade['ticket'],
-                trade['symbol'],
-                trade.get('type', 0),
-                trade.get('lots', 0),
-                trade.get('open_price', 0),
-                datetime.fromtimestamp(trade.get('open_time', data['timestamp'])),
-                trade.get('sl', 0),
-                trade.get('tp', 0),
-                trade.get('profit', 0),
-                trade.get('comment', ''),
-                datetime.fromtimestamp(data['timestamp'])
-            ))
-            trades_inserted += 1
-        
-        conn.commit()
-        
-        logger.info(f"Published {trades_inserted} trades for account {data['account']}")
-        return jsonify({
-            'status': 'success',
-            'trades_count': trades_inserted,
-            'account': data['account'],
-            'timestamp': datetime.now().isoformat()
-        }), 200
-        
-    finally:
-        cursor.close()
-        conn.close()
+    
+    account_row = (
+        account,
+        data.server,
+        data.balance,
+        data.equity,
+        data.margin,
+        data.free_margin,
+        last_update
+    )
+    
+    # Hand off to the background writer, which batches concurrent publishes
+    # into a single transaction
+    request_id = uuid.uuid4().hex
+    publish_queue.put((request_id, account_row, rows))
+    
+    return jsonify({
+        'status': 'accepted',
+        'request_id': request_id,
+        'trades_count': len(rows),
+        'account': account,
+        'timestamp': now_iso()
+    }), 202
 
 @app.route('/api/trades/<int:account_number>', methods=['GET'])
 @require_auth
 @handle_db_error
 def get_trades(account_number):
     """Get trades for specific account"""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     cursor = conn.cursor(dictionary=True)
     
+    # Once the response is built, closing it releases the connection
+    streaming = False
+    
     try:
         # Get account info
-        account_query = "SELECT * FROM accounts WHERE account_number = %s"
+        account_query = """
+        SELECT account_number, server, balance, equity, margin, free_margin,
+               UNIX_TIMESTAMP(last_update) AS last_update, created_at
+        FROM accounts WHERE account_number = %s
+        """
         cursor.execute(account_query, (account_number,))
         account = cursor.fetchone()
         
@@ -245,50 +706,69 @@ def get_trades(account_number):
         
         # Get trades with pagination
         limit = min(int(request.args.get('limit', 100)), 1000)
-        offset = int(request.args.get('offset', 0))
+        before_open_time = request.args.get('before_open_time')
+        before_ticket = request.args.get('before_ticket')
+        pagination = {'limit': limit}
         
-        trades_query = """
-        SELECT * FROM trades 
-        WHERE account_number = %s 
-        ORDER BY open_time DESC
-        LIMIT %s OFFSET %s
-        """
-        cursor.execute(trades_query, (account_number, limit, offset))
-        trades = cursor.fetchall()
-        
-        # Convert datetime objects to timestamps
-        for trade in trades:
-            if 'open_time' in trade and trade['open_time']:
-                trade['open_time'] = int(trade['open_time'].timestamp())
-            if 'last_update' in trade and trade['last_update']:
-                trade['last_update'] = int(trade['last_update'].timestamp())
-        
-        if 'last_update' in account and account['last_update']:
-            account['last_update'] = int(account['last_update'].timestamp())
-        
-        response = {
-            'account': account,
-            'trades': trades,
-            'trades_count': len(trades),
-            'pagination': {
-                'limit': limit,
-                'offset': offset,
-                'has_more': len(trades) == limit
-            }
-        }
-        
-        return jsonify(response), 200
+        if (before_open_time is None) != (before_ticket is None):
+            # A partial cursor would silently fall back to the first page
+            return jsonify({'error': 'before_open_time and before_ticket must be given together'}), 400
+        
+        if before_open_time is not None:
+            # Keyset pagination: seek past the last row of the previous page
+            # instead of scanning and discarding OFFSET rows
+            before_open_time = int(before_open_time)
+            trades_query = """
+            SELECT id, account_number, ticket, symbol, type, lots, open_price,
+                   UNIX_TIMESTAMP(open_time) AS open_time, sl, tp, profit, comment,
+                   UNIX_TIMESTAMP(last_update) AS last_update, created_at
+            FROM trades 
+            WHERE account_number = %s 
+            AND (trades.open_time < FROM_UNIXTIME(%s)
+                 OR (trades.open_time = FROM_UNIXTIME(%s) AND ticket < %s))
+            ORDER BY trades.open_time DESC, ticket DESC
+            LIMIT %s
+            """
+            params = (account_number, before_open_time, before_open_time,
+                      int(before_ticket), limit)
+        else:
+            offset = int(request.args.get('offset', 0))
+            pagination['offset'] = offset
+            trades_query = """
+            SELECT id, account_number, ticket, symbol, type, lots, open_price,
+                   UNIX_TIMESTAMP(open_time) AS open_time, sl, tp, profit, comment,
+                   UNIX_TIMESTAMP(last_update) AS last_update, created_at
+            FROM trades 
+            WHERE account_number = %s 
+            ORDER BY trades.open_time DESC, ticket DESC
+            LIMIT %s OFFSET %s
+            """
+            params = (account_number, limit, offset)
+        
+        cursor.execute(trades_query, params)
+        
+        # Encode rows as they are fetched instead of building the whole
+        # trades list and its JSON document in memory
+        response = Response(stream_trades(cursor, account, pagination),
+                            mimetype='application/json')
+        # Release from the response rather than the generator's finally:
+        # Werkzeug never starts the generator for HEAD requests, and
+        # closing an unstarted generator skips its finally
+        response.call_on_close(stream_release(conn, cursor))
+        streaming = True
+        return response, 200
         
     finally:
-        cursor.close()
-        conn.close()
+        if not streaming:
+            cursor.close()
+            conn.close()
 
 @app.route('/api/accounts', methods=['GET'])
 @require_auth
 @handle_db_error
 def get_accounts():
     """Get all accounts"""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
@@ -296,23 +776,17 @@ def get_accounts():
     
     try:
         query = """
-        SELECT a.*, COUNT(t.ticket) as trades_count
+        SELECT a.account_number, a.server, a.balance, a.equity, a.margin, a.free_margin,
+               UNIX_TIMESTAMP(a.last_update) AS last_update,
+               UNIX_TIMESTAMP(a.created_at) AS created_at,
+               a.trades_count
         FROM accounts a
-        LEFT JOIN trades t ON a.account_number = t.account_number
-        GROUP BY a.account_number
         ORDER BY a.last_update DESC
         """
         
         cursor.execute(query)
         accounts = cursor.fetchall()
         
-        # Convert datetime objects to timestamps
-        for account in accounts:
-            if 'last_update' in account and account['last_update']:
-                account['last_update'] = int(account['last_update'].timestamp())
-            if 'created_at' in account and account['created_at']:
-                account['created_at'] = int(account['created_at'].timestamp())
-        
         return jsonify({'accounts': accounts, 'count': len(accounts)}), 200
         
     finally:
@@ -331,19 +805,22 @@ def close_trade_signal(account_number, ticket):
     cursor = conn.cursor()
     
     try:
-        # Check if trade exists
-        check_query = "SELECT ticket FROM trades WHERE account_number = %s AND ticket = %s"
-        cursor.execute(check_query, (account_number, ticket))
-        if not cursor.fetchone():
-            return jsonify({'error': 'Trade not found'}), 404
-        
-        # Insert close signal
+        # Insert close signal only if the trade exists; no row inserted means
+        # the trade was not found
         signal_query = """
         INSERT INTO trade_signals (account_number, ticket, signal_type, created_at)
-        VALUES (%s, %s, 'CLOSE', %s)
+        SELECT %s, %s, 'CLOSE', %s
+        FROM trades
+        WHERE account_number = %s AND ticket = %s
+        LIMIT 1
         """
         
-        cursor.execute(signal_query, (account_number, ticket, datetime.now()))
+        cursor.execute(signal_query, (account_number, ticket, datetime.now(),
+                                      account_number, ticket))
+        
+        if cursor.rowcount == 0:
+            return jsonify({'error': 'Trade not found'}), 404
+        
         conn.commit()
         
         logger.info(f"Close signal sent for account {account_number}, ticket {ticket}")
@@ -363,7 +840,7 @@ def close_trade_signal(account_number, ticket):
 @handle_db_error
 def get_signals(account_number):
     """Get pending signals for account"""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
@@ -371,19 +848,16 @@ def get_signals(account_number):
     
     try:
         query = """
-        SELECT * FROM trade_signals 
+        SELECT id, account_number, ticket, signal_type, signal_data, processed,
+               processed_at, UNIX_TIMESTAMP(created_at) AS created_at
+        FROM trade_signals 
         WHERE account_number = %s AND processed = FALSE
-        ORDER BY created_at ASC
+        ORDER BY trade_signals.created_at ASC
         """
         
         cursor.execute(query, (account_number,))
         signals = cursor.fetchall()
         
-        # Convert datetime objects to timestamps
-        for signal in signals:
-            if 'created_at' in signal and signal['created_at']:
-                signal['created_at'] = int(signal['created_at'].timestamp())
-        
         return jsonify({'signals': signals, 'count': len(signals)}), 200
         
     finally:
@@ -423,13 +897,14 @@ def mark_signal_processed(signal_id):
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return NOT_FOUND_BODY, 404, JSON_HEADERS
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+    return INTERNAL_ERROR_BODY, 500, JSON_HEADERS
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
-    app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (gunicorn.conf.py)
+    app.run(debug=debug, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -43,6 +43,7 @@ CREATE TABLE IF NOT EXISTS accounts (
     equity DECIMAL(15,2) DEFAULT 0,
     margin DECIMAL(15,2) DEFAULT 0,
     free_margin DECIMAL(15,2) DEFAULT 0,
+    trades_count INT NOT NULL DEFAULT 0,
     last_update TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -66,7 +67,7 @@ CREATE TABLE IF NOT EXISTS trades (
     UNIQUE KEY unique_trade (account_number, ticket),
     INDEX idx_account_symbol (account_number, symbol),
     INDEX idx_open_time (open_time),
-    INDEX idx_trades_account_time (account_number, open_time DESC)
+    INDEX idx_trades_account_time_ticket (account_number, open_time DESC, ticket DESC)
 );
 
 -- Trade signals table
@@ -79,7 +80,7 @@ CREATE TABLE IF NOT EXISTS trade_signals (
     processed BOOLEAN DEFAULT FALSE,
     processed_at TIMESTAMP NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_account_processed (account_number, processed),
+    INDEX idx_signals_account_processed_created (account_number, processed, created_at),
     INDEX idx_created_at (created_at)
 );
 